@@ -29,6 +29,10 @@ Prerequisites:
    - PROJECT_ENDPOINT: Your AI Foundry project endpoint
    - AZURE_PLAYWRIGHT_CONNECTION_NAME: Name of the connection created in step 4
    - MODEL_DEPLOYMENT_NAME: Your model deployment name (e.g., gpt-4.1)
+   - AZURE_CRED_MODE: "cli" or "env" to use only Azure CLI or environment credentials (optional)
+   - DEMO_VERBOSE: Set to "0" to print only errors and the agent's final response (optional)
+   - ENABLE_TRACING: Set to "1" to send traces to Application Insights (optional, off by default)
+   - TRACE_SAMPLE_RATIO: Fraction of traces to keep when tracing is enabled (optional, default: 0.1)
    - AZURE_TRACING_GEN_AI_CONTENT_RECORDING_ENABLED: Set to "true" to capture message content in traces (optional)
 
 Installation:
@@ -38,246 +42,386 @@ Installation:
     pip install azure-monitor-opentelemetry
 """
 
+import asyncio
+import json
+import logging
 import os
-from azure.identity import DefaultAzureCredential
-from azure.ai.projects import AIProjectClient
-from azure.ai.agents.models import (
-    MessageRole,
-    RunStepToolCallDetails,
-    RunStepBrowserAutomationToolCall,
-)
-from azure.ai.agents.telemetry import AIAgentsInstrumentor
-from azure.monitor.opentelemetry import configure_azure_monitor
+import sys
+import textwrap
+from itertools import islice
 from opentelemetry import trace
 
-def main():
+log = logging.getLogger(__name__)
+
+# Tracer handle and span definitions are resolved once at import time; the tracer
+# is a proxy, so it picks up the Azure Monitor provider once tracing is configured
+_TRACER = trace.get_tracer(__name__)
+
+_DEMO_SPAN = "browser_automation_demo"
+_AGENT_SETUP_SPAN = "agent_setup"
+_AGENT_CREATED_EVENT = "agent_created"
+_THREAD_CREATED_EVENT = "thread_created"
+_MESSAGE_CREATED_EVENT = "message_created"
+_AGENT_RUN_SPAN = "agent_run"
+_AGENT_RUN_ATTRS = {"task.type": "stock_price_extraction"}
+
+# Run statuses that mean the agent is still working. "requires_action" is not
+# one of them: this demo has no client-side tools to submit outputs for.
+_ACTIVE_RUN_STATUSES = ("queued", "in_progress")
+_RUN_POLL_INTERVAL = 1.0  # seconds
+_MAX_STEPS_SHOWN = 50  # run steps fetched for the report; later steps are never requested
+
+# Dedented once at import so no indentation is sent to the model as prompt tokens
+_TASK_MESSAGE = textwrap.dedent("""
+    Your goal is to report the Microsoft year-to-date stock price change.
+
+    To do that:
+    1. Go to the website finance.yahoo.com
+    2. At the top of the page, find the search bar
+    3. Enter 'MSFT' to get Microsoft stock information
+    4. On the resulting page, find the default chart showing Microsoft stock price
+    5. Click on 'YTD' at the top of that chart
+    6. Report the percent value that shows below the chart
+
+    Please complete this task and provide me with the YTD percentage change.
+""").strip()
+
+
+def browser_tool(conn_id: str) -> list:
+    """Return a fresh Browser Automation tool definition for a Playwright connection."""
+    return [{
+        "type": "browser_automation",
+        "browser_automation": {
+            "connection": {
+                "id": conn_id,
+            }
+        }
+    }]
+
+
+def create_credential():
+    """Create the Azure credential, skipping sources a local demo never uses.
+
+    Set AZURE_CRED_MODE to "cli" or "env" to use a single credential and
+    bypass the DefaultAzureCredential chain entirely.
+    """
+    from azure.identity import (
+        AzureCliCredential,
+        DefaultAzureCredential,
+        EnvironmentCredential,
+    )
+    
+    mode = os.getenv("AZURE_CRED_MODE")
+    if mode == "cli":
+        return AzureCliCredential()
+    if mode == "env":
+        return EnvironmentCredential()
+    return DefaultAzureCredential(
+        exclude_managed_identity_credential=True,
+        exclude_shared_token_cache_credential=True,
+        exclude_visual_studio_code_credential=True,
+        exclude_interactive_browser_credential=True,
+    )
+
+
+async def main():
     """Run the browser automation demo using Azure AI Foundry Agent Service."""
     
+    # Informational output can be silenced with DEMO_VERBOSE=0; errors and the
+    # agent's final response are always printed
+    verbose = os.getenv("DEMO_VERBOSE", "1") == "1"
+    vprint = print if verbose else lambda *a, **k: None
+    
     # Verify required environment variables
-    required_vars = [
+    required_vars = (
         "PROJECT_ENDPOINT",
         "AZURE_PLAYWRIGHT_CONNECTION_NAME", 
         "MODEL_DEPLOYMENT_NAME"
-    ]
+    )
     
-    missing_vars = [var for var in required_vars if not os.getenv(var)]
+    missing_vars = tuple(var for var in required_vars if not os.environ.get(var))
     if missing_vars:
-        print("❌ Missing required environment variables:")
-        for var in missing_vars:
-            print(f"   - {var}")
-        print("\nPlease set these environment variables before running.")
-        print("\nExample:")
-        print('$env:PROJECT_ENDPOINT = "https://your-project.services.ai.azure.com/api/projects/your-project-id"')
-        print('$env:AZURE_PLAYWRIGHT_CONNECTION_NAME = "playwright-connection"')
-        print('$env:MODEL_DEPLOYMENT_NAME = "gpt-4.1"')
-        print('\nOptional (for tracing):')
-        print('$env:AZURE_TRACING_GEN_AI_CONTENT_RECORDING_ENABLED = "true"')
+        sys.stdout.write(
+            "❌ Missing required environment variables:\n"
+            + "\n".join(f"   - {var}" for var in missing_vars)
+            + "\n\nPlease set these environment variables before running.\n"
+            "\nExample:\n"
+            '$env:PROJECT_ENDPOINT = "https://your-project.services.ai.azure.com/api/projects/your-project-id"\n'
+            '$env:AZURE_PLAYWRIGHT_CONNECTION_NAME = "playwright-connection"\n'
+            '$env:MODEL_DEPLOYMENT_NAME = "gpt-4.1"\n'
+            "\nOptional (for tracing):\n"
+            '$env:ENABLE_TRACING = "1"\n'
+            '$env:TRACE_SAMPLE_RATIO = "0.1"\n'
+            '$env:AZURE_TRACING_GEN_AI_CONTENT_RECORDING_ENABLED = "true"\n'
+        )
         return
     
-    # Enable content recording for traces (optional)
-    if not os.getenv("AZURE_TRACING_GEN_AI_CONTENT_RECORDING_ENABLED"):
-        os.environ["AZURE_TRACING_GEN_AI_CONTENT_RECORDING_ENABLED"] = "true"
-        print("✅ Enabled trace content recording")
+    # Azure SDK imports are deferred until the configuration is known to be valid
+    from azure.ai.projects import AIProjectClient
+    from azure.ai.agents.models import (
+        MessageRole,
+        RunStepToolCallDetails,
+        RunStepBrowserAutomationToolCall,
+    )
+    
+    # Resolve the message roles once for the calls below
+    role_user = MessageRole.USER
+    role_agent = MessageRole.AGENT
     
-    # Create AI Project Client
-    print("🔧 Initializing Azure AI Foundry Project Client...")
+    # Snapshot required settings once; everything below uses these locals
     project_endpoint = os.environ["PROJECT_ENDPOINT"]
+    connection_name = os.environ["AZURE_PLAYWRIGHT_CONNECTION_NAME"]
+    model_name = os.environ["MODEL_DEPLOYMENT_NAME"]
+    
+    # Create AI Project Client
+    vprint("🔧 Initializing Azure AI Foundry Project Client...")
     project_client = AIProjectClient(
         endpoint=project_endpoint,
-        credential=DefaultAzureCredential()
+        credential=create_credential()
     )
     
-    # Configure tracing
-    print("📊 Setting up tracing...")
+    # Configure tracing (opt-in via ENABLE_TRACING=1)
     tracing_enabled = False
-    try:
-        # Get Application Insights connection string
-        connection_string = project_client.telemetry.get_application_insights_connection_string()
+    if os.getenv("ENABLE_TRACING") == "1":
+        vprint("📊 Setting up tracing...")
         
-        if connection_string:
-            print(f"   Found Application Insights connection")
-            print(f"   Connection string: {connection_string[:50]}...")
-            
-            # Configure Azure Monitor for tracing
-            configure_azure_monitor(connection_string=connection_string)
-            
-            # Instrument the AI Agents SDK
-            AIAgentsInstrumentor().instrument()
+        # Enable content recording for traces (optional)
+        if not os.getenv("AZURE_TRACING_GEN_AI_CONTENT_RECORDING_ENABLED"):
+            os.environ["AZURE_TRACING_GEN_AI_CONTENT_RECORDING_ENABLED"] = "true"
+            vprint("✅ Enabled trace content recording")
+        
+        try:
+            # Get Application Insights connection string
+            connection_string = await asyncio.to_thread(
+                project_client.telemetry.get_application_insights_connection_string
+            )
             
-            tracing_enabled = True
-            print(f"✅ Tracing enabled! View traces at: https://ai.azure.com/")
-            print(f"   Navigate to your project > Tracing")
-            print(f"   Note: Traces may take 1-2 minutes to appear in the portal")
-        else:
-            print("⚠️  No Application Insights connected. Tracing disabled.")
-            print("\n   📋 To enable tracing:")
-            print("   1. Go to https://ai.azure.com/")
-            print("   2. Select your project")
-            print("   3. Go to 'Tracing' in the left sidebar")
-            print("   4. Click 'Connect' or 'Create new' Application Insights resource")
-            print("   5. Wait for connection to complete")
-            print("   6. Re-run this script")
-    except Exception as e:
-        print(f"⚠️  Could not enable tracing: {str(e)}")
-        print(f"   Error type: {type(e).__name__}")
-        import traceback
-        print(f"   Details: {traceback.format_exc()}")
-        print("   Continuing without tracing...")
-    
-    # Get tracer for custom spans
-    tracer = trace.get_tracer(__name__)
+            if connection_string:
+                vprint(f"   Found Application Insights connection")
+                vprint(f"   Connection string: {connection_string[:50]}...")
+                
+                # Only load the OpenTelemetry SDK/exporter stack when it will be used
+                from azure.ai.agents.telemetry import AIAgentsInstrumentor
+                from azure.monitor.opentelemetry import configure_azure_monitor
+                
+                # Configure Azure Monitor for tracing
+                sample_ratio = float(os.getenv("TRACE_SAMPLE_RATIO", "0.1"))
+                configure_azure_monitor(
+                    connection_string=connection_string,
+                    sampling_ratio=sample_ratio
+                )
+                
+                # Instrument the AI Agents SDK
+                AIAgentsInstrumentor().instrument()
+                
+                tracing_enabled = True
+                vprint(f"✅ Tracing enabled! View traces at: https://ai.azure.com/")
+                vprint(f"   Navigate to your project > Tracing")
+                vprint(f"   Note: Traces may take 1-2 minutes to appear in the portal")
+                vprint(f"   Sampling {sample_ratio:.0%} of runs (TRACE_SAMPLE_RATIO); set it to 1 to trace every run")
+            else:
+                print("⚠️  No Application Insights connected. Tracing disabled.")
+                vprint("\n   📋 To enable tracing:")
+                vprint("   1. Go to https://ai.azure.com/")
+                vprint("   2. Select your project")
+                vprint("   3. Go to 'Tracing' in the left sidebar")
+                vprint("   4. Click 'Connect' or 'Create new' Application Insights resource")
+                vprint("   5. Wait for connection to complete")
+                vprint("   6. Re-run this script")
+        except Exception as e:
+            print(f"⚠️  Could not enable tracing: {str(e)}")
+            log.debug("Tracing init failed: %s", e, exc_info=True)
+            print("   Continuing without tracing...")
+    else:
+        vprint("📊 Tracing disabled (set ENABLE_TRACING=1 to enable)")
     
     try:
         with project_client:
             # Start tracing span for the entire demo
-            with tracer.start_as_current_span("browser_automation_demo"):
+            with _TRACER.start_as_current_span(_DEMO_SPAN):
                 # Get the Playwright connection
-                print(f"\n🔗 Retrieving Playwright connection: {os.environ['AZURE_PLAYWRIGHT_CONNECTION_NAME']}")
-                playwright_connection = project_client.connections.get(
-                    name=os.environ["AZURE_PLAYWRIGHT_CONNECTION_NAME"]
+                vprint(f"\n🔗 Retrieving Playwright connection: {connection_name}")
+                playwright_connection = await asyncio.to_thread(
+                    project_client.connections.get,
+                    name=connection_name
                 )
-                print(f"✅ Connected! Connection ID: {playwright_connection.id}")
+                vprint(f"✅ Connected! Connection ID: {playwright_connection.id}")
                 
-                # Create agent with Browser Automation tool
-                print("\n🤖 Creating AI Agent with Browser Automation tool...")
-                with tracer.start_as_current_span("create_agent"):
-                    agent = project_client.agents.create_agent(
-                        model=os.environ["MODEL_DEPLOYMENT_NAME"],
+                # Create agent, thread and message under a single setup span;
+                # each sub-operation is recorded as an event on that span
+                with _TRACER.start_as_current_span(_AGENT_SETUP_SPAN) as setup_span:
+                    # Create agent with Browser Automation tool
+                    vprint("\n🤖 Creating AI Agent with Browser Automation tool...")
+                    agent = await asyncio.to_thread(
+                        project_client.agents.create_agent,
+                        model=model_name,
                         name="browser-automation-agent",
                         instructions="""You are a helpful assistant with browser automation capabilities.
                         You can navigate websites, extract information, and interact with web pages.
                         Use the browser automation tool to complete tasks as requested.""",
-                        tools=[{
-                            "type": "browser_automation",
-                            "browser_automation": {
-                                "connection": {
-                                    "id": playwright_connection.id,
-                                }
-                            }
-                        }],
+                        tools=browser_tool(playwright_connection.id),
                     )
-                    print(f"✅ Agent created! Agent ID: {agent.id}")
-                
-                # Create a thread for conversation
-                print("\n💬 Creating conversation thread...")
-                with tracer.start_as_current_span("create_thread"):
-                    thread = project_client.agents.threads.create()
-                    print(f"✅ Thread created! Thread ID: {thread.id}")
-                
-                # Create a message with the task
-                print("\n📝 Sending task to agent...")
-                task_message = """
-                Your goal is to report the Microsoft year-to-date stock price change.
-                
-                To do that:
-                1. Go to the website finance.yahoo.com
-                2. At the top of the page, find the search bar
-                3. Enter 'MSFT' to get Microsoft stock information
-                4. On the resulting page, find the default chart showing Microsoft stock price
-                5. Click on 'YTD' at the top of that chart
-                6. Report the percent value that shows below the chart
-                
-                Please complete this task and provide me with the YTD percentage change.
-                """
-                
-                with tracer.start_as_current_span("create_message"):
-                    message = project_client.agents.messages.create(
+                    setup_span.add_event(_AGENT_CREATED_EVENT, {"agent.id": agent.id})
+                    vprint(f"✅ Agent created! Agent ID: {agent.id}")
+                    
+                    # Create a thread for conversation
+                    vprint("\n💬 Creating conversation thread...")
+                    thread = await asyncio.to_thread(project_client.agents.threads.create)
+                    setup_span.add_event(_THREAD_CREATED_EVENT, {"thread.id": thread.id})
+                    vprint(f"✅ Thread created! Thread ID: {thread.id}")
+                    
+                    # Create a message with the task
+                    vprint("\n📝 Sending task to agent...")
+                    message = await asyncio.to_thread(
+                        project_client.agents.messages.create,
                         thread_id=thread.id,
-                        role=MessageRole.USER,
-                        content=task_message
+                        role=role_user,
+                        content=_TASK_MESSAGE
                     )
-                    print(f"✅ Message created! Message ID: {message.id}")
+                    setup_span.add_event(_MESSAGE_CREATED_EVENT, {"message.id": message.id})
+                    vprint(f"✅ Message created! Message ID: {message.id}")
                 
                 # Create and process the agent run
-                print("\n⏳ Agent is working... This may take a minute as it navigates the website...")
-                print("   (The agent will launch a browser, search for MSFT, and extract the data)")
+                vprint("\n⏳ Agent is working... This may take a minute as it navigates the website...")
+                vprint("   (The agent will launch a browser, search for MSFT, and extract the data)")
                 
-                with tracer.start_as_current_span("agent_run"):
-                    # Add custom attributes to the span
-                    current_span = trace.get_current_span()
-                    current_span.set_attribute("agent.id", agent.id)
-                    current_span.set_attribute("thread.id", thread.id)
-                    current_span.set_attribute("task.type", "stock_price_extraction")
+                with _TRACER.start_as_current_span(_AGENT_RUN_SPAN, attributes=_AGENT_RUN_ATTRS) as current_span:
+                    # Add custom attributes to the span in a single call
+                    current_span.set_attributes({"agent.id": agent.id, "thread.id": thread.id})
                     
-                    run = project_client.agents.runs.create_and_process(
+                    run = await asyncio.to_thread(
+                        project_client.agents.runs.create,
                         thread_id=thread.id,
                         agent_id=agent.id
                     )
                     
+                    # Poll without blocking the event loop while the agent drives the browser
+                    while run.status in _ACTIVE_RUN_STATUSES:
+                        await asyncio.sleep(_RUN_POLL_INTERVAL)
+                        run = await asyncio.to_thread(
+                            project_client.agents.runs.get,
+                            thread_id=thread.id,
+                            run_id=run.id
+                        )
+                    
                     # Record run status in span
-                    current_span.set_attribute("run.status", run.status)
-                    current_span.set_attribute("run.id", run.id)
+                    current_span.set_attributes({"run.status": run.status, "run.id": run.id})
                 
-                print(f"\n✅ Agent run completed! Status: {run.status}")
+                vprint(f"\n✅ Agent run completed! Status: {run.status}")
                 
                 if run.status == "failed":
                     print(f"❌ Run failed: {run.last_error}")
                     return
                 
-                # Get the run steps to see browser automation details
-                print("\n📊 Browser Automation Steps:")
-                print("=" * 80)
-                run_steps = project_client.agents.run_steps.list(
-                    thread_id=thread.id,
-                    run_id=run.id
-                )
+                if run.status == "requires_action":
+                    # Browser automation runs server-side; an action request means the
+                    # agent wants a tool this demo does not provide, so stop the run
+                    await asyncio.to_thread(
+                        project_client.agents.runs.cancel,
+                        thread_id=thread.id,
+                        run_id=run.id
+                    )
+                    print(f"❌ Run {run.id} requested a client-side action this demo cannot handle; run cancelled.")
+                    return
                 
-                for step_num, step in enumerate(run_steps, 1):
-                    print(f"\nStep {step_num} - Status: {step.status}")
+                # The step report is informational only; skip fetching and formatting it entirely
+                # when DEMO_VERBOSE=0
+                if verbose:
+                    # Get the run steps to see browser automation details
+                    print("\n📊 Browser Automation Steps:")
+                    print("=" * 80)
+                    # Paging happens while iterating, so materialize the steps off the event loop
+                    run_steps = await asyncio.to_thread(
+                        lambda: list(islice(
+                            project_client.agents.run_steps.list(
+                                thread_id=thread.id,
+                                run_id=run.id,
+                                # Page no larger than needed (the API caps pages at 100)
+                                limit=min(100, _MAX_STEPS_SHOWN)
+                            ),
+                            _MAX_STEPS_SHOWN
+                        ))
+                    )
+                    
+                    # Keep only steps with browser automation tool calls, grouped per step
+                    browser_steps = []
+                    for step_num, step in enumerate(run_steps, 1):
+                        if isinstance(step.step_details, RunStepToolCallDetails):
+                            calls = [
+                                call for call in step.step_details.tool_calls
+                                if isinstance(call, RunStepBrowserAutomationToolCall)
+                            ]
+                            if calls:
+                                browser_steps.append((step_num, step, calls))
                     
-                    if isinstance(step.step_details, RunStepToolCallDetails):
-                        tool_calls = step.step_details.tool_calls
-                        
-                        for call in tool_calls:
-                            if isinstance(call, RunStepBrowserAutomationToolCall):
-                                print(f"\n  🌐 Browser Automation Tool Call:")
-                                print(f"     Input: {call.browser_automation.input}")
-                                print(f"     Output: {call.browser_automation.output}")
-                                
-                                if hasattr(call.browser_automation, 'steps') and call.browser_automation.steps:
-                                    print(f"\n     Browser Steps:")
-                                    for i, browser_step in enumerate(call.browser_automation.steps, 1):
-                                        print(f"       {i}. Last result: {browser_step.last_step_result}")
-                                        print(f"          Current state: {browser_step.current_state}")
-                                        print(f"          Next step: {browser_step.next_step}")
+                    # Build the whole report first and write it in one go
+                    lines = []
+                    for step_num, step, calls in browser_steps:
+                        lines.append(f"\nStep {step_num} - Status: {step.status}")
+                        for call in calls:
+                            browser_automation = call.browser_automation
+                            lines.append(f"\n  🌐 Browser Automation Tool Call:")
+                            lines.append(f"     Input: {browser_automation.input}")
+                            lines.append(f"     Output: {browser_automation.output}")
+                            
+                            steps = getattr(browser_automation, "steps", None)
+                            if steps:
+                                lines.append(f"\n     Browser Steps:")
+                                for i, browser_step in enumerate(steps, 1):
+                                    # One JSON line per browser step: cheap to build and easy to parse
+                                    lines.append("       " + json.dumps({
+                                        "i": i,
+                                        "last": browser_step.last_step_result,
+                                        "state": browser_step.current_state,
+                                        "next": browser_step.next_step,
+                                    }, default=str, ensure_ascii=False))
+                    if len(run_steps) == _MAX_STEPS_SHOWN:
+                        lines.append(f"\n   ... report truncated to the first {_MAX_STEPS_SHOWN} run steps")
+                    if lines:
+                        print("\n".join(lines))
                 
                 # Get the agent's final response
                 print("\n" + "=" * 80)
                 print("🎯 Agent's Final Response:")
                 print("=" * 80)
                 
-                response_message = project_client.agents.messages.get_last_message_by_role(
+                response_message = await asyncio.to_thread(
+                    project_client.agents.messages.get_last_message_by_role,
                     thread_id=thread.id,
-                    role=MessageRole.AGENT
+                    role=role_agent
                 )
                 
                 if response_message:
-                    for text_message in response_message.text_messages:
-                        print(f"\n{text_message.text.value}")
+                    if response_message.text_messages:
+                        print("\n" + "\n\n".join(t.text.value for t in response_message.text_messages))
                     
                     # Print any URL citations
                     if response_message.url_citation_annotations:
-                        print("\n📎 Citations:")
-                        for annotation in response_message.url_citation_annotations:
-                            print(f"   - {annotation.url_citation.title}: {annotation.url_citation.url}")
+                        citations = [
+                            f"   - {annotation.url_citation.title}: {annotation.url_citation.url}"
+                            for annotation in response_message.url_citation_annotations
+                        ]
+                        print("\n📎 Citations:\n" + "\n".join(citations))
                 
                 # Keep the agent for reuse
-                print(f"\n💾 Agent preserved for future use!")
-                print(f"   Agent ID: {agent.id}")
-                print(f"   Thread ID: {thread.id}")
-                print(f"\n   You can reuse this agent in future runs.")
+                vprint(f"\n💾 Agent preserved for future use!")
+                vprint(f"   Agent ID: {agent.id}")
+                vprint(f"   Thread ID: {thread.id}")
+                vprint(f"\n   You can reuse this agent in future runs.")
                 
-                print("\n✨ Demo completed successfully!")
+                vprint("\n✨ Demo completed successfully!")
                 
                 if tracing_enabled:
-                    print("\n📊 View detailed traces at: https://ai.azure.com/")
-                    print("   Navigate to: Your Project > Tracing")
-                    print("   You'll see timeline, browser actions, and performance metrics!")
-                    print("\n   ⏱️  Note: Traces can take 1-2 minutes to appear in Application Insights")
-                    print("   💡 Tip: Refresh the Tracing page if you don't see them immediately")
+                    vprint("\n📊 View detailed traces at: https://ai.azure.com/")
+                    vprint("   Navigate to: Your Project > Tracing")
+                    vprint("   You'll see timeline, browser actions, and performance metrics!")
+                    vprint("\n   ⏱️  Note: Traces can take 1-2 minutes to appear in Application Insights")
+                    vprint("   💡 Tip: Refresh the Tracing page if you don't see them immediately")
+                    vprint(f"   🎲 Only {sample_ratio:.0%} of runs are sampled, so this run may not have been exported;")
+                    vprint("      set TRACE_SAMPLE_RATIO=1 to trace every run")
                 else:
-                    print("\n⚠️  Tracing was not enabled for this run.")
-                    print("   Connect Application Insights in the portal to enable tracing.")
+                    vprint("\n⚠️  Tracing was not enabled for this run.")
+                    vprint("   Set ENABLE_TRACING=1 and connect Application Insights in the portal to enable tracing.")
             
     except Exception as e:
         print(f"\n❌ Error: {str(e)}")
@@ -290,4 +434,10 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    # Set PYTHONLOGLEVEL=DEBUG to see full tracebacks for tracing setup failures.
+    # Only this module's logger follows it; Azure/OTel libraries stay at WARNING.
+    logging.basicConfig(level=logging.WARNING)
+    level_name = os.getenv("PYTHONLOGLEVEL", "WARNING").strip().upper()
+    level = int(level_name) if level_name.isdigit() else logging.getLevelName(level_name)
+    log.setLevel(level if isinstance(level, int) else logging.WARNING)
+    asyncio.run(main())